@@ -1,5 +1,14 @@
 
-from typing import List, Tuple, Dict
+import sys
+from typing import List, Tuple, Dict, NamedTuple
+
+# Popcount without building a binary string: int.bit_count (3.10+) maps to
+# the CPU's popcount instruction, bin(x).count('1') allocates O(n) per call.
+if sys.version_info >= (3, 10):
+    _popcount = int.bit_count
+else:
+    def _popcount(x: int) -> int:
+        return bin(x).count('1')
 
 # ---------- Pauli utilities ----------
 # We represent a Pauli operator as (sign, string) where sign ∈ {+1,-1} and
@@ -14,6 +23,23 @@ _SINGLE_MULT = {
     ('Z','I'):(0,'Z'), ('Z','X'):(1,'Y'), ('Z','Y'):(3,'X'), ('Z','Z'):(0,'I'),
 }
 
+# Flat lookup tables for the string path: each character is translated to
+# a code in {0,1,2,3} (I,X,Y,Z) and the pair (a, b) is looked up directly at
+# index (a << 2) | b, instead of hashing a tuple of strings per qubit. The
+# tables are padded to 256 entries so they can be applied with bytes.translate.
+_PAULI_CHARS = 'IXYZ'
+_PAULI_CODE = bytes.maketrans(b'IXYZ', bytes(range(4)))
+_DROP_PAULI = str.maketrans('', '', 'IXYZ')  # leaves only invalid characters
+_MULT_PHASE = bytes(_SINGLE_MULT[(a,b)][0] for a in _PAULI_CHARS for b in _PAULI_CHARS).ljust(256, b'\0')
+_MULT_CHAR = bytes(ord(_SINGLE_MULT[(a,b)][1]) for a in _PAULI_CHARS for b in _PAULI_CHARS).ljust(256, b'\0')
+
+def _pauli_codes(P: str) -> bytes:
+    """Translate a Pauli string to a bytes object of codes in {0,1,2,3}."""
+
+    if P.translate(_DROP_PAULI):
+        raise ValueError(f"Invalid Pauli string {P!r}")
+    return P.encode('ascii').translate(_PAULI_CODE)
+
 def multiply_pauli(p: Tuple[int,str], q: Tuple[int,str]) -> Tuple[int,str]:
     """Multiply two n-qubit Pauli strings (±1 phases only, but we track i^k and fold into ±1).
     Returns a Hermitian Pauli (phase in {+1,-1})."""
@@ -21,15 +47,19 @@ def multiply_pauli(p: Tuple[int,str], q: Tuple[int,str]) -> Tuple[int,str]:
     sp, P = p
     sq, Q = q
 
-    assert len(P) == len(Q), "Mismatched length"
+    if len(P) != len(Q):
+        raise ValueError("Mismatched length")
+
+    n = len(P)
 
-    phase_exp = 0  # in Z4
-    out_chars = []
+    # Build every table index (a << 2) | b at once: codes are at most 3, so
+    # shifting the big-endian integer of P's codes by two bits never carries
+    # between bytes.
+    keys = ((int.from_bytes(_pauli_codes(P), 'big') << 2)
+            | int.from_bytes(_pauli_codes(Q), 'big')).to_bytes(n, 'big')
 
-    for a,b in zip(P,Q):
-        e, r = _SINGLE_MULT[(a,b)]
-        phase_exp = (phase_exp + e) % 4
-        out_chars.append(r)
+    phases = keys.translate(_MULT_PHASE)
+    phase_exp = (phases.count(1) + 3 * phases.count(3)) % 4  # in Z4
 
     # i^(phase_exp) * sp * sq -> fold i's into ±1 by requiring Hermitian output.
     # For products of Hermitian Paulis, phase_exp is always even (0 or 2).
@@ -40,27 +70,296 @@ def multiply_pauli(p: Tuple[int,str], q: Tuple[int,str]) -> Tuple[int,str]:
     
     sign = sp * sq * (1 if phase_exp == 0 else -1)
 
-    return (sign, ''.join(out_chars))
+    return (sign, keys.translate(_MULT_CHAR).decode('ascii'))
 
 def anticommutes(P: str, Q: str) -> bool:
     """Return True iff Pauli strings P and Q anticommute."""
 
-    assert len(P) == len(Q), "Mismatched length"
+    if len(P) != len(Q):
+        raise ValueError("Mismatched length")
+
+    xp, zp = pauli_to_xz(P)
+    xq, zq = pauli_to_xz(Q)
+    return _popcount((xp & zq) ^ (zp & xq)) & 1 == 1
+
+# ---------- Symplectic (bit-vector) Pauli representation ----------
+# Internally a Pauli is held as an EncodedPauli (sign, x, z) where x and z
+# are Python ints with one bit per qubit: X -> (1,0), Y -> (1,1), Z -> (0,1),
+# I -> (0,0).
+# The leftmost character of the string is the most significant bit, and
+# Y is taken as i*X*Z. Products and commutation checks then reduce to a few
+# bigint operations instead of a Python-level loop over the qubits.
+
+# Codes {0,1,2,3} (I,X,Y,Z) -> the ASCII binary digit of their x / z bit.
+_X_DIGIT = bytes.maketrans(bytes(range(4)), b'0110')
+_Z_DIGIT = bytes.maketrans(bytes(range(4)), b'0011')
+_CHAR_OF = str.maketrans('0123', 'IZXY')  # hex digit (x_bit << 1) | z_bit -> letter
+
+def pauli_to_xz(s: str) -> Tuple[int,int]:
+    """Encode a Pauli string like "IXYZ" as its (x_bits, z_bits) pair."""
 
-    anti_pairs = {('X','Y'),('Y','X'),('X','Z'),('Z','X'),('Y','Z'),('Z','Y')}
-    parity = 0
+    if not s:
+        return 0, 0
 
-    for a,b in zip(P,Q):
-        if a != 'I' and b != 'I' and a != b and (a,b) in anti_pairs:
-            parity ^= 1
-    return parity == 1
+    # One translate per bit plane turns the string into a binary literal,
+    # which int() parses in C; there is no Python loop over the qubits.
+    codes = _pauli_codes(s)
+    return int(codes.translate(_X_DIGIT), 2), int(codes.translate(_Z_DIGIT), 2)
+
+def xz_to_pauli(x: int, z: int, n: int) -> str:
+    """Decode an (x_bits, z_bits) pair back to an n-character Pauli string."""
+
+    if not n:
+        return ''
+
+    # Reading each plane's binary digits as hex spreads one qubit per hex
+    # digit; (x << 1) | z then gives a digit 0-3 per qubit with no carries,
+    # and a single translate maps the digits to letters.
+    xd = int(format(x, f'0{n}b'), 16)
+    zd = int(format(z, f'0{n}b'), 16)
+    return format((xd << 1) | zd, f'0{n}x').translate(_CHAR_OF)
+
+class EncodedPauli(NamedTuple):
+    """A signed Pauli in symplectic form; unpacks like (sign, x, z)."""
+
+    sign: int
+    x: int
+    z: int
+
+def _product_flips_sign(xp: int, zp: int, xq: int, zq: int) -> bool:
+    """Return True iff (xp,zp)*(xq,zq) is -1 times the Pauli (xp^xq, zp^zq)."""
+
+    # Each factor carries i^|x&z| from its Y's, and commuting Z_p past X_q
+    # contributes (-1)^|z_p&x_q|; the result absorbs i^|x&z| for its own Y's.
+    phase_exp = (_popcount(xp & zp) + _popcount(xq & zq)
+                 + 2 * _popcount(zp & xq) - _popcount((xp ^ xq) & (zp ^ zq))) & 3
+
+    if phase_exp & 1:
+        raise ValueError("Non-Hermitian phase encountered (±i). Check inputs.")
+
+    return phase_exp == 2
+
+def _iter_bits(v: int):
+    """Yield the positions of the set bits of v, lowest first."""
+
+    while v:
+        low = v & -v
+        yield low.bit_length() - 1
+        v ^= low
+
+def anticommuting_rows(xs: List[int], zs: List[int], m: EncodedPauli) -> List[int]:
+    """Return the indices j for which the Pauli (xs[j], zs[j]) anticommutes with m.
+
+    The whole column is produced in one pass with the parity expression
+    inlined, so no Python-level call is made per generator."""
+
+    _, mx, mz = m
+    popcount = _popcount
+    return [j for j, (x, z) in enumerate(zip(xs, zs))
+            if popcount((x & mz) ^ (z & mx)) & 1]
 
 def pretty(p: Tuple[int,str]) -> str:
     s, P = p
     return ('+' if s>=0 else '-') + P
 
+# ---------- Generator table with per-qubit support index ----------
+
+class StabilizerTable:
+    """Encoded stabilizer generators plus a per-qubit support index.
+
+    Rows are stored as parallel arrays: xs[j] / zs[j] are the x / z ints of
+    row j, and signs is a bitmask over rows with bit j set when row j
+    carries a -1 sign, so sign updates for many rows are a single XOR.
+
+    xcols[q] / zcols[q] are bitmasks over rows: bit j is set when row j has an
+    X / Z component at bit q of its x / z int. The rows anticommuting with a
+    measurement M are then the XOR of xcols over M's Z support and zcols over
+    M's X support, so a low-weight M only touches a few columns instead of
+    every generator. Rows and columns are kept in sync on every write."""
+
+    def __init__(self, n: int):
+        self.n = n
+        self.signs = 0
+        self.xs: List[int] = []
+        self.zs: List[int] = []
+        self.xcols = [0] * n
+        self.zcols = [0] * n
+
+    @classmethod
+    def from_list(cls, gens: List[Tuple[int,str]], n: int) -> 'StabilizerTable':
+        """Build a table from (sign, pauli_string) pairs on n qubits.
+
+        Lengths are validated here, once, so the per-measurement kernels can
+        work on the encoded rows without any further checks."""
+
+        if any(len(P) != n for _, P in gens):
+            raise ValueError("Stabilizer generators must all have the same length")
+
+        # Encode all rows into lists sized once, then fill the column index
+        # in a single pass instead of growing both row by row.
+        table = cls(n)
+        pairs = [pauli_to_xz(P) for _, P in gens]
+        table.xs = [x for x, _ in pairs]
+        table.zs = [z for _, z in pairs]
+        table.signs = sum(1 << j for j, (sg, _) in enumerate(gens) if sg < 0)
+
+        xcols, zcols = table.xcols, table.zcols
+        for j, (x, z) in enumerate(pairs):
+            bit = 1 << j
+            for q in _iter_bits(x):
+                xcols[q] |= bit
+            for q in _iter_bits(z):
+                zcols[q] |= bit
+        return table
+
+    def to_list(self) -> List[Tuple[int,str]]:
+        """Decode the rows back to (sign, pauli_string) pairs."""
+
+        n, signs = self.n, self.signs
+        return [(-1 if (signs >> j) & 1 else +1, xz_to_pauli(x, z, n))
+                for j, (x, z) in enumerate(zip(self.xs, self.zs))]
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+    def row(self, j: int) -> EncodedPauli:
+        """Return row j as an EncodedPauli."""
+
+        return EncodedPauli(-1 if (self.signs >> j) & 1 else +1, self.xs[j], self.zs[j])
+
+    def _toggle(self, mask: int, dx: int, dz: int) -> None:
+        """Flip the rows in mask on the columns where their x / z bits changed."""
+
+        xcols, zcols = self.xcols, self.zcols
+        for q in _iter_bits(dx):
+            xcols[q] ^= mask
+        for q in _iter_bits(dz):
+            zcols[q] ^= mask
+
+    def append(self, g: EncodedPauli) -> None:
+        j = len(self.xs)
+        self._toggle(1 << j, g.x, g.z)
+        self.xs.append(g.x)
+        self.zs.append(g.z)
+        if g.sign < 0:
+            self.signs |= 1 << j
+
+    def replace(self, j: int, g: EncodedPauli) -> None:
+        bit = 1 << j
+        self._toggle(bit, self.xs[j] ^ g.x, self.zs[j] ^ g.z)
+        self.xs[j] = g.x
+        self.zs[j] = g.z
+        self.signs = (self.signs & ~bit) | (bit if g.sign < 0 else 0)
+
+    def multiply_rows(self, mask: int, g: EncodedPauli) -> None:
+        """Replace every row j in mask by row(j) * g.
+
+        Each of those rows changes by exactly g's x / z bits, so the index
+        is updated with one column XOR per bit of g rather than per row.
+        The signs are computed for all rows in mask at once from the columns:
+        on each qubit where g is not I, the rows picking up +i or -i are
+        read off xcols/zcols, and a two-bit counter per row (bit-sliced over
+        the lo/hi masks) sums those phases mod 4. Phase accumulation and the
+        column update share a single walk over g's support."""
+
+        _, gx, gz = g
+        xs, zs = self.xs, self.zs
+        flips = mask if g.sign < 0 else 0
+
+        if _popcount(mask) < _popcount(gx | gz):
+            # Few rows against a heavy g: per-row phases are cheaper.
+            for j in _iter_bits(mask):
+                x, z = xs[j], zs[j]
+                if _product_flips_sign(x, z, gx, gz):
+                    flips ^= 1 << j
+                xs[j] = x ^ gx
+                zs[j] = z ^ gz
+            self.signs ^= flips
+            self._toggle(mask, gx, gz)
+            return
+
+        xcols, zcols = self.xcols, self.zcols
+        lo = hi = 0
+
+        for q in _iter_bits(gx | gz):
+            xcol, zcol = xcols[q], zcols[q]
+            xc, zc = xcol & mask, zcol & mask
+            gxq, gzq = (gx >> q) & 1, (gz >> q) & 1
+            if gxq and gzq:     # g is Y: X*Y = iZ, Z*Y = -iX
+                plus, minus = xc & ~zc, zc & ~xc
+            elif gxq:           # g is X: Z*X = iY, Y*X = -iZ
+                plus, minus = zc & ~xc, xc & zc
+            else:               # g is Z: Y*Z = iX, X*Z = -iY
+                plus, minus = xc & zc, xc & ~zc
+            carry = lo & plus
+            lo ^= plus
+            hi ^= carry
+            borrow = minus & ~lo
+            lo ^= minus
+            hi ^= borrow
+
+            # The columns just read are updated in the same walk rather
+            # than in a second pass over g's support.
+            if gxq:
+                xcols[q] = xcol ^ mask
+            if gzq:
+                zcols[q] = zcol ^ mask
+
+        if lo:
+            raise ValueError("Non-Hermitian phase encountered (±i). Check inputs.")
+
+        self.signs ^= flips ^ hi
+
+        for j in _iter_bits(mask):
+            xs[j] ^= gx
+            zs[j] ^= gz
+
+    def anticommuting(self, m: EncodedPauli) -> int:
+        """Return a bitmask over rows of the generators anticommuting with m."""
+
+        _, mx, mz = m
+        anti = 0
+
+        if _popcount(mx) + _popcount(mz) > len(self):
+            # Dense measurement: a direct scan of the rows is cheaper.
+            for j in anticommuting_rows(self.xs, self.zs, m):
+                anti |= 1 << j
+            return anti
+
+        xcols, zcols = self.xcols, self.zcols
+        for q in _iter_bits(mz):
+            anti ^= xcols[q]
+        for q in _iter_bits(mx):
+            anti ^= zcols[q]
+        return anti
+
 # ---------- Stabilizer (resource) update with fusion measurements ----------
 
+def _apply_fusion(table: StabilizerTable, meas: EncodedPauli) -> None:
+    """Apply one encoded measurement (outcome, x, z) to the table in place.
+
+    This is the per-measurement kernel of update_resource_with_fusions:
+    anticommutation scan, pivot selection, pivot replacement and the
+    multiplication of the remaining anticommuting rows by the old pivot."""
+
+    # Find all anti-commuting stabilizers
+    anti = table.anticommuting(meas)
+
+    if not anti:
+        # Commutes with everything: add M as a new stabilizer with the outcome sign.
+        table.append(meas)
+        return
+
+    # Choose pivot (first)
+    p = (anti & -anti).bit_length() - 1
+    old_pivot = table.row(p)  # (sign, x, z)
+
+    # Replace pivot by the measurement with its sign
+    table.replace(p, meas)
+
+    # For every *other* anti-commuting stabilizer, multiply by the old pivot
+    table.multiply_rows(anti ^ (1 << p), old_pivot)
+
 def update_resource_with_fusions(
     resource_gens: List[Tuple[int,str]],
     fusion_meas: List[str],
@@ -92,35 +391,25 @@ def update_resource_with_fusions(
     if outcomes is None:
         outcomes = {}
 
-    gens = resource_gens[:]  # copy
-    n = len(gens[0][1]) if gens else (len(fusion_meas[0]) if fusion_meas else 0)
+    n = len(resource_gens[0][1]) if resource_gens else (len(fusion_meas[0]) if fusion_meas else 0)
+
+    # Encode every generator once; all updates below only touch the cached
+    # x/z ints, and strings are rebuilt on return.
+    table = StabilizerTable.from_list(resource_gens, n)
 
+    # Resolve the outcome and encoding of each distinct measurement string
+    # once; repeats reuse the same EncodedPauli instead of hashing into
+    # outcomes and re-encoding the string again.
+    encoded: Dict[str,EncodedPauli] = {}
     for M in fusion_meas:
-        if len(M) != n:
-            raise ValueError("Measurement length does not match stabilizer length")
-        outcome = outcomes.get(M, +1)
-
-        # Find all anti-commuting stabilizers
-        anti_idx = [j for j,(sg, G) in enumerate(gens) if anticommutes(G, M)]
-
-        if not anti_idx:
-            # Commutes with everything: add M as a new stabilizer with the outcome sign.
-            gens.append((outcome, M))
-            continue
-
-        # Choose pivot (first)
-        p = anti_idx[0]
-        old_pivot = gens[p]  # (sign, string)
-
-        # Replace pivot by the measurement with its sign
-        gens[p] = (outcome, M)
-
-        # For every *other* anti-commuting stabilizer, multiply by the old pivot
-        for j in anti_idx[1:]:
-            gens[j] = multiply_pauli(gens[j], old_pivot)
-            
-        # Done with this measurement
-    return gens
+        m = encoded.get(M)
+        if m is None:
+            if len(M) != n:
+                raise ValueError("Measurement length does not match stabilizer length")
+            m = encoded[M] = EncodedPauli(outcomes.get(M, +1), *pauli_to_xz(M))
+        _apply_fusion(table, m)
+
+    return table.to_list()
 
 # ---------- User interface for input and output ----------
 def user_interface():
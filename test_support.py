@@ -0,0 +1,146 @@
+import random
+import unittest
+
+import support
+
+
+def reference_update(resource_gens, fusion_meas, outcomes=None):
+    """The original string-based fusion update, built on multiply_pauli/anticommutes."""
+
+    if outcomes is None:
+        outcomes = {}
+
+    gens = resource_gens[:]
+
+    for M in fusion_meas:
+        outcome = outcomes.get(M, +1)
+        anti_idx = [j for j, (sg, G) in enumerate(gens) if support.anticommutes(G, M)]
+
+        if not anti_idx:
+            gens.append((outcome, M))
+            continue
+
+        p = anti_idx[0]
+        old_pivot = gens[p]
+        gens[p] = (outcome, M)
+
+        for j in anti_idx[1:]:
+            gens[j] = support.multiply_pauli(gens[j], old_pivot)
+    return gens
+
+
+def random_pauli(rng, n, weight=None):
+    if weight is None:
+        return ''.join(rng.choice('IXYZ') for _ in range(n))
+    chars = ['I'] * n
+    for i in rng.sample(range(n), weight):
+        chars[i] = rng.choice('XYZ')
+    return ''.join(chars)
+
+
+def random_group(rng, n, sparse=False):
+    """A commuting generator list on n qubits, reached by measuring random Paulis."""
+
+    gens = [(+1, 'I' * i + 'Z' + 'I' * (n - i - 1)) for i in range(n)]
+    meas = [random_pauli(rng, n, rng.randint(1, min(2, n)) if sparse else None)
+            for _ in range(rng.randint(0, 2 * n))]
+    return reference_update(gens, meas, {m: rng.choice([1, -1]) for m in meas})
+
+
+class UpdateResourceWithFusionsTest(unittest.TestCase):
+
+    def test_matches_reference_on_random_inputs(self):
+        rng = random.Random(1)
+        for _ in range(500):
+            n = rng.randint(1, 10)
+            gens = random_group(rng, n, sparse=rng.random() < 0.5)
+            gens = gens[:rng.randint(0, len(gens))]
+            meas = [random_pauli(rng, n, rng.randint(0, n) if rng.random() < 0.5 else None)
+                    for _ in range(rng.randint(0, 2 * n))]
+            outcomes = {m: rng.choice([1, -1]) for m in meas if rng.random() < 0.7}
+
+            self.assertEqual(support.update_resource_with_fusions(gens, meas, outcomes),
+                             reference_update(gens, meas, outcomes))
+
+    def test_matches_reference_on_fusion_pairs(self):
+        rng = random.Random(2)
+        for _ in range(200):
+            n = rng.randint(2, 12)
+            gens = random_group(rng, n)
+            meas = []
+            for _ in range(n):
+                a, b = rng.sample(range(n), 2)
+                for P in 'XZ':
+                    chars = ['I'] * n
+                    chars[a] = chars[b] = P
+                    meas.append(''.join(chars))
+
+            self.assertEqual(support.update_resource_with_fusions(gens, meas),
+                             reference_update(gens, meas))
+
+    def test_non_hermitian_product_raises(self):
+        # XX anticommutes with ZI: one row against a weight-2 pivot (per-row phases).
+        with self.assertRaises(ValueError):
+            reference_update([(1, 'XX'), (1, 'ZI')], ['YI'])
+        with self.assertRaises(ValueError):
+            support.update_resource_with_fusions([(1, 'XX'), (1, 'ZI')], ['YI'])
+
+        # X anticommutes with Z: two rows against a weight-1 pivot (bit-sliced phases).
+        with self.assertRaises(ValueError):
+            reference_update([(1, 'X'), (1, 'Z'), (-1, 'Z')], ['Y'])
+        with self.assertRaises(ValueError):
+            support.update_resource_with_fusions([(1, 'X'), (1, 'Z'), (-1, 'Z')], ['Y'])
+
+    def test_invalid_input_raises(self):
+        with self.assertRaises(ValueError):
+            support.update_resource_with_fusions([(1, 'XX')], ['X'])
+        with self.assertRaises(ValueError):
+            support.update_resource_with_fusions([(1, 'XX'), (1, 'Z')], [])
+        with self.assertRaises(ValueError):
+            support.update_resource_with_fusions([(1, '\x03\x03')], ['\x01\x01'])
+
+
+class MultiplyRowsTest(unittest.TestCase):
+
+    def check_multiply_rows(self, gens, mask, p):
+        n = len(gens[0][1])
+        table = support.StabilizerTable.from_list(gens, n)
+        table.multiply_rows(mask, table.row(p))
+
+        expected = [support.multiply_pauli(g, gens[p]) if (mask >> j) & 1 else g
+                    for j, g in enumerate(gens)]
+        self.assertEqual(table.to_list(), expected)
+
+        # The support index must still describe the updated rows.
+        self.assertEqual(table.anticommuting(table.row(p)),
+                         sum(1 << j for j, (_, G) in enumerate(expected)
+                             if support.anticommutes(G, gens[p][1])))
+
+    def test_few_rows_heavy_pivot(self):
+        rng = random.Random(3)
+        for _ in range(300):
+            n = rng.randint(2, 10)
+            gens = random_group(rng, n)
+            heavy = [j for j, (_, G) in enumerate(gens) if len(G) - G.count('I') >= 2]
+            if len(gens) < 2 or not heavy:
+                continue
+            p = rng.choice(heavy)
+            j = rng.choice([k for k in range(len(gens)) if k != p])
+            self.check_multiply_rows(gens, 1 << j, p)
+
+    def test_many_rows_light_pivot(self):
+        rng = random.Random(4)
+        for _ in range(300):
+            n = rng.randint(2, 10)
+            gens = random_group(rng, n, sparse=True)
+            p = min(range(len(gens)), key=lambda j: len(gens[j][1]) - gens[j][1].count('I'))
+            others = [k for k in range(len(gens)) if k != p]
+            weight = len(gens[p][1]) - gens[p][1].count('I')
+            if len(others) < weight:
+                continue
+            mask = sum(1 << k for k in rng.sample(others, rng.randint(weight, len(others))))
+            self.check_multiply_rows(gens, mask, p)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file